@@ -0,0 +1,103 @@
+import threading
+import time
+
+from otrs_python_api.exceptions import InvalidInitArgument
+
+
+class Endpoint:
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, webservice_url: str):
+        """
+        Health state of one OTRS web frontend
+        :param webservice_url: Webservice url of the frontend
+        """
+        self.webservice_url = webservice_url
+        self.outstanding = 0
+        self.latency = 0.0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def __repr__(self):
+        return "<{0}(url={1}, outstanding={2}, latency={3:.3f}, failures={4})>".format(
+            self.__class__.__name__, self.webservice_url, self.outstanding, self.latency, self.failures)
+
+
+class Balancer:
+    DEFAULT_EJECT_TIME = 30.0
+    DEFAULT_MAX_FAILURES = 1
+
+    def __init__(self, webservice_urls: list, eject_time: float = None, max_failures: int = None):
+        """
+        Distributes requests between several OTRS web frontends. The frontend with the least outstanding requests is
+        chosen, ties are broken by the smoothed latency. A frontend that fails max_failures times in a row is ejected
+        for eject_time seconds
+        :param webservice_urls: Webservice urls of the frontends
+        :param eject_time: Number of seconds a failed frontend is excluded from selection
+        :param max_failures: Number of consecutive failures after which a frontend is ejected
+        """
+        self._eject_time = eject_time or Balancer.DEFAULT_EJECT_TIME
+        self._max_failures = max_failures or Balancer.DEFAULT_MAX_FAILURES
+        self.validate_args(webservice_urls)
+        self._endpoints = [Endpoint(url) for url in webservice_urls]
+        self._lock = threading.Lock()
+
+    def validate_args(self, webservice_urls: list):
+        if not isinstance(webservice_urls, list) or not webservice_urls:
+            raise InvalidInitArgument(f"Webservice urls {webservice_urls} must be non-empty list")
+        for url in webservice_urls:
+            if not isinstance(url, str):
+                raise InvalidInitArgument(f"Webservice url {url} must be str")
+        if not isinstance(self._eject_time, float):
+            raise InvalidInitArgument(f"Eject time {self._eject_time} must be float")
+        if not isinstance(self._max_failures, int):
+            raise InvalidInitArgument(f"Max failures {self._max_failures} must be int")
+
+    @property
+    def endpoints(self) -> list:
+        return list(self._endpoints)
+
+    def acquire(self, exclude: list = None) -> Endpoint:
+        """
+        Choose a frontend and count the request as outstanding on it. Frontends from exclude are skipped unless there
+        is nothing else left. If every frontend is ejected, the one whose ejection ends first is used
+        """
+        exclude = exclude or []
+        with self._lock:
+            now = time.monotonic()
+            candidates = [e for e in self._endpoints if e not in exclude] or self._endpoints
+            available = [e for e in candidates if e.is_available(now)]
+            if available:
+                endpoint = min(available, key=lambda e: (e.outstanding, e.latency))
+            else:
+                endpoint = min(candidates, key=lambda e: e.ejected_until)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, latency: float = None, failed: bool = False):
+        """
+        Finish the request on the frontend and update its health
+        :param endpoint: Frontend returned by acquire
+        :param latency: Request duration in seconds, used only for successful requests
+        :param failed: Whether the frontend failed to serve the request
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if failed:
+                endpoint.failures += 1
+                if endpoint.failures >= self._max_failures:
+                    endpoint.ejected_until = time.monotonic() + self._eject_time
+                return
+            endpoint.failures = 0
+            endpoint.ejected_until = 0.0
+            if latency is not None:
+                if endpoint.latency:
+                    endpoint.latency += Endpoint.LATENCY_SMOOTHING * (latency - endpoint.latency)
+                else:
+                    endpoint.latency = latency
+
+    def has_alternative(self, exclude: list) -> bool:
+        return any(e not in exclude for e in self._endpoints)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+    Консольная утилита для массовых операций с заявками OTRS.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+
+from otrs_python_api.exceptions import OTRSException, OTRSServerError, InvalidInitArgument
+from otrs_python_api.otrs import OTRS
+from otrs_python_api.ticket import Ticket
+from otrs_python_api.utils.configuration_loading import prepare_logging
+
+RETRIABLE_ERRORS = (OTRSServerError, requests.ConnectionError, requests.Timeout)
+
+
+class RateLimiter:
+    def __init__(self, rate: float = None):
+        """
+        Spreads calls evenly so that no more than rate calls per second are made
+        :param rate: Calls per second. Without it calls are not limited
+        """
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def parse_pairs(pairs: list) -> dict:
+    result = {}
+    for pair in pairs or []:
+        name, sep, value = pair.partition('=')
+        if not sep:
+            raise argparse.ArgumentTypeError(f"{pair} must be NAME=VALUE")
+        result[name] = value
+    return result
+
+
+def ticket_ids_from_stdin(stream):
+    for line in stream:
+        ticket_id = line.strip()
+        if ticket_id:
+            yield ticket_id
+
+
+def ticket_get(client: OTRS, ticket_id, args) -> dict:
+    ticket = client.ticket_get(ticket_id, articles=False, attachments=False)
+    return ticket.dict(dynamic_fields=True)
+
+
+def ticket_export(client: OTRS, ticket_id, args) -> dict:
+    return client.ticket_get_raw(ticket_id)
+
+
+def ticket_update(client: OTRS, ticket_id, args) -> dict:
+    ticket = Ticket(**parse_pairs(args.set))
+    for name, value in parse_pairs(args.dynamic_field).items():
+        ticket.set_dynamic_field(name, value)
+    return client.ticket_update(ticket_id, ticket)
+
+
+def ticket_close(client: OTRS, ticket_id, args) -> dict:
+    return client.ticket_update(ticket_id, Ticket(State=args.state))
+
+
+OPERATIONS = {
+    'get': ticket_get,
+    'export': ticket_export,
+    'update': ticket_update,
+    'close': ticket_close,
+}
+
+
+def run_operation(client: OTRS, operation, ticket_id, args, limiter: RateLimiter) -> dict:
+    attempt = 0
+    while True:
+        limiter.wait()
+        try:
+            return {'TicketID': ticket_id, 'ok': True, 'result': operation(client, ticket_id, args)}
+        except RETRIABLE_ERRORS as e:
+            if attempt >= args.retries:
+                return {'TicketID': ticket_id, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            time.sleep(args.retry_delay * 2 ** attempt)
+            attempt += 1
+        except Exception as e:
+            return {'TicketID': ticket_id, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+
+def process(client: OTRS, ticket_ids, args, output) -> (int, int):
+    """
+    Runs the operation for every ticket id with at most args.concurrency requests in flight and writes one NDJSON line
+    per ticket as soon as it is done
+    Returns: number of succeeded and failed tickets
+    """
+    operation = OPERATIONS[args.operation]
+    limiter = RateLimiter(args.rate)
+    succeeded, failed = 0, 0
+    pending = set()
+
+    def write_done(done):
+        nonlocal succeeded, failed
+        for future in done:
+            result = future.result()
+            if result['ok']:
+                succeeded += 1
+            else:
+                failed += 1
+            output.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+        output.flush()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for ticket_id in ticket_ids:
+            if len(pending) >= args.concurrency * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write_done(done)
+            pending.add(executor.submit(run_operation, client, operation, ticket_id, args, limiter))
+        done, _ = wait(pending)
+        write_done(done)
+    return succeeded, failed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='otrs', description='Bulk operations with OTRS tickets. Ticket ids are read '
+                                                              'from stdin one per line unless --search is given')
+    parser.add_argument('operation', choices=sorted(OPERATIONS))
+    parser.add_argument('--url', default=os.environ.get('OTRS_URL'))
+    parser.add_argument('--login', default=os.environ.get('OTRS_LOGIN'))
+    parser.add_argument('--password', default=os.environ.get('OTRS_PASSWORD'))
+    parser.add_argument('--interface', default=os.environ.get('OTRS_INTERFACE'))
+    parser.add_argument('--webservice-url', action='append', help='may be repeated to balance between frontends')
+    parser.add_argument('--session-cache-filename')
+    parser.add_argument('--no-verify', dest='verify', action='store_false')
+    parser.add_argument('--search', action='append', metavar='NAME=VALUE', help='ticket_search argument')
+    parser.add_argument('--set', action='append', metavar='NAME=VALUE', help='ticket field for update')
+    parser.add_argument('--dynamic-field', action='append', metavar='NAME=VALUE', help='dynamic field for update')
+    parser.add_argument('--state', default='closed successful', help='state for close')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rate', type=float, help='max requests per second')
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--retry-delay', type=float, default=1.0, help='initial delay between retries in seconds')
+    parser.add_argument('--log-level', default='WARNING')
+    return parser
+
+
+def main(argv: list = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error('--concurrency must be positive')
+    prepare_logging(args.log_level)
+
+    try:
+        search_args = parse_pairs(args.search)
+        update_fields = parse_pairs(args.set)
+        update_dynamic_fields = parse_pairs(args.dynamic_field)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if args.operation == 'update' and not update_fields and not update_dynamic_fields:
+        parser.error('update requires --set or --dynamic-field')
+    if not args.webservice_url and not (args.url and args.interface):
+        parser.error('either --webservice-url or both --url and --interface are required')
+    webservice_url = args.webservice_url[0] if args.webservice_url and len(args.webservice_url) == 1 \
+        else args.webservice_url
+    try:
+        client = OTRS(url=args.url or '', login=args.login, password=args.password, interface=args.interface or '',
+                      verify=args.verify, session_cache_filename=args.session_cache_filename,
+                      webservice_url=webservice_url)
+    except InvalidInitArgument as e:
+        parser.error(str(e))
+
+    started = time.monotonic()
+    try:
+        client.connection.ensure_session()
+        ticket_ids = client.ticket_search(**search_args) if search_args else ticket_ids_from_stdin(sys.stdin)
+    except (OTRSException, requests.RequestException) as e:
+        print(f"otrs: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    succeeded, failed = process(client, ticket_ids, args, sys.stdout)
+    elapsed = time.monotonic() - started
+    total = succeeded + failed
+    print(f"{total} tickets in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.1f}/s): {succeeded} succeeded, "
+          f"{failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
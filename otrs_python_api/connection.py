@@ -1,8 +1,13 @@
 import json
+import threading
+import time
+from typing import Union
+
 import requests
 
+from otrs_python_api.balancer import Balancer
 from otrs_python_api.exceptions import OTRSException, AuthError, HTTPMethodNotSupportedError, OTRSBadResponse, \
-    AccessDeniedError, InvalidParameterError, InvalidInitArgument
+    AccessDeniedError, InvalidParameterError, InvalidInitArgument, OTRSServerError
 from otrs_python_api.session import Session
 from otrs_python_api.utils.configuration_loading import logger
 
@@ -11,11 +16,13 @@ class Connection:
     DEFAULT_SESSION_TIMEOUT = 28800
     DEFAULT_CONNECT_TIMEOUT = 60.0
     DEFAULT_READ_TIMEOUT = 60.0
+    IDEMPOTENT_METHODS = ('GET',)
 
     def __init__(self, url: str, login: str, password: str, interface: str, session_timeout: int = None,
                  session_id: str = None, session_time_created: str = None, priority: int = None, verify: bool = None,
-                 session_cache_filename: str = None, webservice_url: str = None, connect_timeout: float = None,
-                 read_timeout: float = None):
+                 session_cache_filename: str = None, webservice_url: Union[str, list] = None,
+                 connect_timeout: float = None, read_timeout: float = None, eject_time: float = None,
+                 max_failures: int = None):
         self._login = login
         self._password = password
         self._session_timeout = session_timeout or Connection.DEFAULT_SESSION_TIMEOUT
@@ -25,17 +32,20 @@ class Connection:
         self._priority = priority or 1
         self._webservice_url = webservice_url or f"{url}/otrs/nph-genericinterface.pl/Webservice/{interface}/"
         self.validate_args(url=url, interface=interface)
+        webservice_urls = self._webservice_url if isinstance(self._webservice_url, list) else [self._webservice_url]
+        self._balancer = Balancer(webservice_urls=webservice_urls, eject_time=eject_time, max_failures=max_failures)
         self._session = Session(session_cache_filename=session_cache_filename, login=self._login, session_id=session_id,
                                 time_created=session_time_created, read_timeout=self._read_timeout,
                                 expiry=self._session_timeout)
+        self._session_lock = threading.Lock()
 
     def validate_args(self, url: str, interface: str):
         if not isinstance(url, str):
             raise InvalidInitArgument(f"Url {url} must be str")
         if not isinstance(interface, str):
             raise InvalidInitArgument(f"Interface {interface} must be str")
-        if not isinstance(self._webservice_url, str):
-            raise InvalidInitArgument(f"Webservice url {self._webservice_url} must be str")
+        if not isinstance(self._webservice_url, (str, list)):
+            raise InvalidInitArgument(f"Webservice url {self._webservice_url} must be str or list")
         if not isinstance(self._login, str):
             raise InvalidInitArgument(f"Login {self._login} must be str")
         if not isinstance(self._password, str):
@@ -50,7 +60,7 @@ class Connection:
             raise InvalidInitArgument(f"Priority {self._read_timeout} must be float")
 
     def _create_session(self) -> str:
-        response = self._perform_request(http_method='POST', url=f'{self._webservice_url}Session', proxies=None,
+        response = self._perform_request(http_method='POST', path='Session', proxies=None, idempotent=True,
                                          UserLogin=self._login, Password=self._password)
         self._check_response_params(response)
         session_id = response.get('SessionID')
@@ -78,7 +88,44 @@ class Connection:
             else:
                 raise OTRSException(response)
 
-    def _perform_request(self, http_method: str, url: str, proxies, **kwargs) -> dict:
+    def _perform_request(self, http_method: str, path: str, proxies, idempotent: bool = None, **kwargs) -> dict:
+        """
+        Send the request to one of the webservice urls. Idempotent requests that fail on a frontend because of a
+        connection error, a timeout or a 5xx response are repeated on another frontend
+        """
+        if idempotent is None:
+            idempotent = http_method in Connection.IDEMPOTENT_METHODS
+        tried = []
+        while True:
+            endpoint = self._balancer.acquire(exclude=tried)
+            tried.append(endpoint)
+            started = time.monotonic()
+            try:
+                resp = self._send(http_method, endpoint.webservice_url + path, proxies, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._balancer.release(endpoint, failed=True)
+                if idempotent and self._balancer.has_alternative(tried):
+                    logger.warning(f"Webservice url {endpoint.webservice_url} failed, retrying on another one")
+                    continue
+                raise
+            except BaseException:
+                self._balancer.release(endpoint)
+                raise
+            if resp.status_code >= 500:
+                self._balancer.release(endpoint, failed=True)
+                if idempotent and self._balancer.has_alternative(tried):
+                    logger.warning(f"Webservice url {endpoint.webservice_url} responded {resp.status_code}, "
+                                   f"retrying on another one")
+                    continue
+                raise OTRSServerError(resp.text)
+            self._balancer.release(endpoint, latency=time.monotonic() - started)
+
+            if resp.status_code != 200:
+                raise OTRSBadResponse(resp.text)
+
+            return resp.json()
+
+    def _send(self, http_method: str, url: str, proxies, **kwargs) -> requests.Response:
         logger.info(f"Url format: {url}, http_method: {http_method} data: {json.dumps(kwargs)}, proxies: {proxies}, "
                     f"verify: {self._verify}")
         if http_method == 'GET':
@@ -94,29 +141,38 @@ class Connection:
                                   timeout=(self._connect_timeout, self._read_timeout))
         else:
             raise HTTPMethodNotSupportedError()
+        return resp
 
-        if resp.status_code != 200:
-            raise OTRSBadResponse(resp.text)
-
-        return resp.json()
-
-    def _collecting_request_url(self, semantic_url: str, **kwargs) -> str:
-        prepared_url = self._webservice_url + semantic_url
+    def ensure_session(self) -> str:
+        """
+        Get the cached session or create a new one. Creation is serialized, so threads sharing the connection log in
+        once
+        """
         session_id = self._session.get_session()
-        if not session_id:
-            session_id = self._create_session()
-        url = prepared_url.format(SessionID=session_id, **kwargs)
-        return url
+        if session_id:
+            return session_id
+        with self._session_lock:
+            session_id = self._session.get_session()
+            if not session_id:
+                session_id = self._create_session()
+            return session_id
+
+    def _clear_session(self, session_id: str):
+        with self._session_lock:
+            if self._session.get_session() == session_id:
+                self._session.clear_session()
 
     def send_request(self, http_method: str, semantic_url: str, proxies=None, **kwargs) -> dict:
-        url = self._collecting_request_url(semantic_url, **kwargs)
-        response = self._perform_request(http_method, url, proxies, **kwargs)
+        session_id = self.ensure_session()
+        path = semantic_url.format(SessionID=session_id, **kwargs)
+        response = self._perform_request(http_method, path, proxies, **kwargs)
         try:
             self._check_response_params(response)
         except AuthError:
-            self._session.clear_session()
-            url = self._collecting_request_url(semantic_url, **kwargs)
-            response = self._perform_request(http_method, url, proxies, **kwargs)
+            self._clear_session(session_id)
+            session_id = self.ensure_session()
+            path = semantic_url.format(SessionID=session_id, **kwargs)
+            response = self._perform_request(http_method, path, proxies, **kwargs)
             self._check_response_params(response)
 
         return response
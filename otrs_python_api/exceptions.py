@@ -10,6 +10,10 @@ class OTRSBadResponse(OTRSException):
     pass
 
 
+class OTRSServerError(OTRSBadResponse):
+    pass
+
+
 class AuthError(OTRSException):
     pass
 
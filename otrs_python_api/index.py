@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import defaultdict
+
+from otrs_python_api.exceptions import InvalidInitArgument, ArgumentMissingError
+from otrs_python_api.ticket import Ticket
+from otrs_python_api.utils.configuration_loading import logger
+
+
+class TicketIndex:
+    CHANGE_TIME_FIELD = 'Changed'
+
+    def __init__(self, otrs=None, max_staleness: float = None, **search_args):
+        """
+        Local hash indexes over tickets fed by ticket_get results. Every field and dynamic field of a ticket is indexed
+        by value, so lookups are answered without a ticket_search round trip. Fields holding a list, such as multiselect
+        dynamic fields, are indexed by each item
+        :param otrs: OTRS client used to keep the index fresh. Without it the index is only fed manually
+        :param max_staleness: Number of seconds after which lookups first pull changed tickets from the server. If not
+        set, lookups are always answered from the index as is
+        :param search_args: ticket_search arguments limiting the tickets pulled from the server. Required for refreshes
+        unless given later to load
+        """
+        self._otrs = otrs
+        self._max_staleness = max_staleness
+        self._search_args = search_args
+        self.validate_args()
+        self._tickets = {}
+        self._values = defaultdict(lambda: defaultdict(set))
+        self._last_change_time = None
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def validate_args(self):
+        if self._max_staleness is not None and not isinstance(self._max_staleness, float):
+            raise InvalidInitArgument(f"Max staleness {self._max_staleness} must be float")
+        if self._max_staleness is not None and not self._otrs:
+            raise InvalidInitArgument("Max staleness requires OTRS client")
+
+    @staticmethod
+    def _indexed_fields(ticket: Ticket) -> dict:
+        return ticket.dict(dynamic_fields=True)
+
+    @staticmethod
+    def _indexed_values(fields: dict):
+        for name, value in fields.items():
+            for item in value if isinstance(value, list) else [value]:
+                try:
+                    hash(item)
+                except TypeError:
+                    continue
+                yield name, item
+
+    def add(self, ticket: Ticket):
+        ticket_id = str(ticket.get_field('TicketID'))
+        fields = self._indexed_fields(ticket)
+        with self._lock:
+            self._remove(ticket_id)
+            self._tickets[ticket_id] = Ticket(**fields)
+            for name, value in self._indexed_values(fields):
+                self._values[name][value].add(ticket_id)
+
+    def remove(self, ticket_id):
+        with self._lock:
+            self._remove(str(ticket_id))
+
+    def _remove(self, ticket_id: str):
+        ticket = self._tickets.pop(ticket_id, None)
+        if not ticket:
+            return
+        for name, value in self._indexed_values(self._indexed_fields(ticket)):
+            ticket_ids = self._values[name][value]
+            ticket_ids.discard(ticket_id)
+            if not ticket_ids:
+                del self._values[name][value]
+
+    def get(self, ticket_id):
+        self._ensure_fresh()
+        return self._tickets.get(str(ticket_id))
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def is_stale(self) -> bool:
+        if self._max_staleness is None:
+            return False
+        if self._refreshed_at is None:
+            return True
+        return time.monotonic() - self._refreshed_at > self._max_staleness
+
+    def _ensure_fresh(self):
+        if not self.is_stale():
+            return
+        with self._refresh_lock:
+            if self.is_stale():
+                self._refresh()
+
+    def load(self, **kwargs):
+        """
+        Fill the index with tickets found by ticket_search with the given arguments. The arguments are kept and limit
+        the following refreshes
+        """
+        if not kwargs:
+            raise ArgumentMissingError("Search arguments required")
+        with self._refresh_lock:
+            self._search_args = kwargs
+            self._last_change_time = None
+            self._refresh()
+
+    def refresh(self):
+        """
+        Pull tickets matching the search arguments and changed since the latest TicketChangeTime of the previously
+        pulled tickets. Indexed tickets that changed and no longer match the search arguments are removed. Without a
+        known TicketChangeTime all tickets matching the search arguments are pulled
+        """
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self):
+        if not self._search_args:
+            raise ArgumentMissingError("Search arguments required, pass them to enable_index or load")
+        started = time.monotonic()
+        if self._last_change_time:
+            logger.info(f"Refresh index: pull tickets changed since {self._last_change_time}")
+            changed_since = {'TicketChangeTimeNewerDate': self._last_change_time}
+            ticket_ids = self._otrs.ticket_search(**changed_since, **self._search_args)
+            left_ids = set(str(tid) for tid in self._otrs.ticket_search(**changed_since)) - \
+                set(str(tid) for tid in ticket_ids)
+            for ticket_id in left_ids:
+                self.remove(ticket_id)
+        else:
+            ticket_ids = self._otrs.ticket_search(**self._search_args)
+        last_change_time = self._last_change_time
+        for ticket_id in ticket_ids:
+            ticket = self._otrs.ticket_get(ticket_id, articles=False, attachments=False)
+            if self._otrs.index is not self:
+                self.add(ticket)
+            change_time = ticket.get_field(TicketIndex.CHANGE_TIME_FIELD)
+            if change_time and (not last_change_time or change_time > last_change_time):
+                last_change_time = change_time
+        self._last_change_time = last_change_time
+        self._refreshed_at = started
+
+    def filter(self, **kwargs) -> list:
+        """
+        Returns: list of tickets whose fields are equal to all the given values
+        """
+        self._ensure_fresh()
+        with self._lock:
+            ticket_ids = None
+            for name, value in kwargs.items():
+                try:
+                    found = self._values.get(name, {}).get(value, set())
+                except TypeError:
+                    found = {tid for tid, ticket in self._tickets.items()
+                             if self._indexed_fields(ticket).get(name) == value}
+                ticket_ids = found if ticket_ids is None else ticket_ids & found
+                if not ticket_ids:
+                    return []
+            if ticket_ids is None:
+                return list(self._tickets.values())
+            return [self._tickets[tid] for tid in ticket_ids]
+
+    def find_by_dynamic_field(self, name: str, value) -> list:
+        """
+        Returns: list of tickets with the dynamic field name equal to value
+        """
+        return self.filter(**{'DynamicField_' + name: value})
@@ -2,25 +2,38 @@
 """
     Модуль предоставляет интерфейс для взаимодействия с OTRS 4 версии.
 """
+from typing import Union
+
 from otrs_python_api.article import Article
 from otrs_python_api.connection import Connection
 from otrs_python_api.exceptions import InvalidTicketGetArgument, InvalidTicketCreateArgument, \
     InvalidTicketUpdateArgument
+from otrs_python_api.index import TicketIndex
 from otrs_python_api.ticket import Ticket
 
 
 class OTRS:
     def __init__(self, url: str = None, login: str = None, password: str = None, interface: str = None,
                  session_timeout: int = None, priority: int = None, verify: bool = None, session_id: str = None,
-                 session_time_created: int = None, session_cache_filename: str = None, webservice_url: str = None,
-                 connect_timeout: float = None, read_timeout: float = None, connection: Connection = None):
+                 session_time_created: int = None, session_cache_filename: str = None,
+                 webservice_url: Union[str, list] = None, connect_timeout: float = None, read_timeout: float = None,
+                 eject_time: float = None, max_failures: int = None, connection: Connection = None):
         self.connection = connection or Connection(url=url, login=login, password=password, interface=interface,
                                                    session_timeout=session_timeout, session_id=session_id,
                                                    session_time_created=session_time_created,
                                                    priority=priority, verify=verify,
                                                    session_cache_filename=session_cache_filename,
                                                    webservice_url=webservice_url, connect_timeout=connect_timeout,
-                                                   read_timeout=read_timeout)
+                                                   read_timeout=read_timeout, eject_time=eject_time,
+                                                   max_failures=max_failures)
+        self.index = None
+
+    def enable_index(self, max_staleness: float = None, **search_args) -> TicketIndex:
+        """
+            Start feeding ticket_get results with dynamic fields into a local TicketIndex
+        """
+        self.index = TicketIndex(otrs=self, max_staleness=max_staleness, **search_args)
+        return self.index
 
     def ticket_search(self, **kwargs) -> list:
         """
@@ -36,6 +49,17 @@ class OTRS:
 
     def ticket_get(self, ticket_id, articles: bool = True, dynamic_fields: bool = True, attachments: bool = True) \
             -> Ticket:
+        ticket = Ticket(**self.ticket_get_raw(ticket_id, articles=articles, dynamic_fields=dynamic_fields,
+                                              attachments=attachments))
+        if self.index is not None and dynamic_fields:
+            self.index.add(ticket)
+        return ticket
+
+    def ticket_get_raw(self, ticket_id, articles: bool = True, dynamic_fields: bool = True, attachments: bool = True) \
+            -> dict:
+        """
+            Returns: ticket as returned by the server, with all articles and their attachments
+        """
         if not isinstance(ticket_id, (str, int)):
             raise InvalidTicketGetArgument(f"Ticket id {ticket_id} must be str")
         if not isinstance(articles, bool):
@@ -58,7 +82,7 @@ class OTRS:
             TicketID=ticket_id,
             params=params
         )
-        return Ticket(**resp['Ticket'][0])
+        return resp['Ticket'][0]
 
     def ticket_create(self, ticket: Ticket, article: Article, **kwargs) -> dict:
         """
@@ -0,0 +1,69 @@
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def _reply(self, body: dict):
+        self.server.hits += 1
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.end_headers()
+            return
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path.startswith('/Ticket/'):
+            self._reply({'Ticket': [{'TicketID': path.rsplit('/', 1)[-1]}]})
+        else:
+            self._reply({'TicketID': [self.server.name]})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.server.status == 200:
+            self.server.sessions += 1
+            time.sleep(self.server.session_delay)
+        self._reply({'SessionID': 'stub-session'})
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, name: str, status: int = 200, session_delay: float = 0.0):
+        """
+        Local OTRS webservice answering session creation, ticket search with its name and ticket get
+        :param name: Ticket id returned by ticket search
+        :param status: Status of every response
+        :param session_delay: Number of seconds session creation takes
+        """
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.name = name
+        self.status = status
+        self.session_delay = session_delay
+        self.hits = 0
+        self.sessions = 0
+
+    @property
+    def webservice_url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+
+def start_stub(name: str, status: int = 200, session_delay: float = 0.0) -> StubServer:
+    server = StubServer(name, status=status, session_delay=session_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_stub(server: StubServer):
+    server.shutdown()
+    server.server_close()
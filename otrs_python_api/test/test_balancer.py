@@ -0,0 +1,64 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from otrs_python_api import otrs
+from otrs_python_api.balancer import Balancer
+from otrs_python_api.exceptions import HTTPMethodNotSupportedError
+from otrs_python_api.test.stub_server import start_stub, stop_stub
+
+
+class TestBalancer(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        for server in self.servers:
+            stop_stub(server)
+        self.cache_dir.cleanup()
+
+    def _client(self, *servers):
+        self.servers.extend(servers)
+        urls = [s.webservice_url for s in servers]
+        return otrs.OTRS(url='http://unused', login='login', password='password', interface='stub',
+                         webservice_url=urls, session_cache_filename=os.path.join(self.cache_dir.name, 'session'),
+                         connect_timeout=1.0, read_timeout=5.0)
+
+    def test_least_outstanding_frontend_chosen(self):
+        balancer = Balancer(webservice_urls=['http://a/', 'http://b/'])
+        first = balancer.acquire()
+        second = balancer.acquire()
+        self.assertNotEqual(first, second)
+        balancer.release(first, latency=0.5)
+        balancer.release(second, latency=0.1)
+        self.assertIs(second, balancer.acquire())
+
+    def test_failed_frontend_ejected_and_get_retried(self):
+        broken = start_stub('broken', status=503)
+        client = self._client(broken, start_stub('healthy'))
+        for _ in range(5):
+            self.assertEqual(['healthy'], client.ticket_search(Title='x'))
+        self.assertEqual(1, broken.hits)
+
+    def test_outstanding_released_on_unexpected_error(self):
+        client = self._client(start_stub('a'), start_stub('b'))
+        for _ in range(2):
+            with self.assertRaises(HTTPMethodNotSupportedError):
+                client.connection.send_request(http_method='DELETE', semantic_url='Ticket?SessionID={SessionID}')
+        self.assertEqual([0, 0], [e.outstanding for e in client.connection._balancer.endpoints])
+
+    def test_threads_share_one_session(self):
+        server = start_stub('a', session_delay=0.05)
+        client = self._client(server)
+        threads = [threading.Thread(target=client.ticket_search, kwargs={'Title': 'x'}) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, server.sessions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from otrs_python_api import cli
+from otrs_python_api.exceptions import OTRSBadResponse, OTRSServerError
+from otrs_python_api.test.stub_server import start_stub, stop_stub
+from otrs_python_api.ticket import Ticket
+
+
+class StubOTRS:
+    def __init__(self, failures: int = 0, error=OTRSServerError):
+        self.failures = failures
+        self.error = error
+
+    def ticket_get(self, ticket_id, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise self.error('busy')
+        return Ticket(TicketID=ticket_id, DynamicField_TicketIPAddress='10.0.0.1')
+
+    def ticket_get_raw(self, ticket_id, **kwargs):
+        articles = [{'Subject': 'First', 'Body': 'Body'}, {'Subject': 'Second', 'Body': 'Body'}]
+        return {'TicketID': ticket_id, 'Article': articles}
+
+
+class TestCli(unittest.TestCase):
+    def _process(self, client, ticket_ids, *argv):
+        args = cli.build_parser().parse_args(['get', '--retry-delay', '0', *argv])
+        output = io.StringIO()
+        counts = cli.process(client, ticket_ids, args, output)
+        return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_get_writes_ndjson(self):
+        counts, lines = self._process(StubOTRS(), cli.ticket_ids_from_stdin(io.StringIO('1\n\n2\n3\n')),
+                                      '--concurrency', '2')
+        self.assertEqual((3, 0), counts)
+        self.assertEqual({'1', '2', '3'}, {line['TicketID'] for line in lines})
+        self.assertEqual('10.0.0.1', lines[0]['result']['DynamicField_TicketIPAddress'])
+
+    def test_retries(self):
+        counts, lines = self._process(StubOTRS(failures=1), ['1'], '--retries', '1')
+        self.assertEqual((1, 0), counts)
+        counts, lines = self._process(StubOTRS(failures=2), ['1'], '--retries', '1')
+        self.assertEqual((0, 1), counts)
+        self.assertIn('busy', lines[0]['error'])
+
+    def test_export_keeps_all_articles(self):
+        args = cli.build_parser().parse_args(['export'])
+        output = io.StringIO()
+        cli.process(StubOTRS(), ['1'], args, output)
+        articles = json.loads(output.getvalue())['result']['Article']
+        self.assertEqual(['First', 'Second'], [a['Subject'] for a in articles])
+
+    def test_client_errors_not_retried(self):
+        client = StubOTRS(failures=1, error=OTRSBadResponse)
+        counts, lines = self._process(client, ['1'], '--retries', '1')
+        self.assertEqual((0, 1), counts)
+
+
+class TestCliMain(unittest.TestCase):
+    def setUp(self):
+        self.server = start_stub('1', session_delay=0.05)
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        stop_stub(self.server)
+        self.cache_dir.cleanup()
+
+    def test_workers_share_one_session(self):
+        argv = ['get', '--login', 'login', '--password', 'password', '--concurrency', '8',
+                '--webservice-url', self.server.webservice_url,
+                '--session-cache-filename', os.path.join(self.cache_dir.name, 'session')]
+        stdin = io.StringIO(''.join(f'{i}\n' for i in range(20)))
+        with mock.patch('sys.stdin', stdin), mock.patch('sys.stdout', io.StringIO()) as stdout, \
+                mock.patch('sys.stderr', io.StringIO()):
+            self.assertEqual(0, cli.main(argv))
+        self.assertEqual(20, len(stdout.getvalue().splitlines()))
+        self.assertEqual(1, self.server.sessions)
+
+    def test_target_required(self):
+        with mock.patch.dict(os.environ, {'OTRS_URL': '', 'OTRS_INTERFACE': ''}), \
+                mock.patch('sys.stderr', io.StringIO()), self.assertRaises(SystemExit):
+            cli.main(['get', '--login', 'login', '--password', 'password'])
+
+    def test_update_requires_fields(self):
+        with mock.patch('sys.stderr', io.StringIO()), self.assertRaises(SystemExit):
+            cli.main(['update', '--login', 'login', '--password', 'password',
+                      '--webservice-url', self.server.webservice_url])
+
+
+if __name__ == '__main__':
+    unittest.main()
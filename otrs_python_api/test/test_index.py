@@ -0,0 +1,119 @@
+import unittest
+
+from otrs_python_api import otrs
+from otrs_python_api.exceptions import ArgumentMissingError
+from otrs_python_api.index import TicketIndex
+from otrs_python_api.ticket import Ticket
+
+
+def make_ticket(ticket_id, ip_address, changed, queue='Raw'):
+    return Ticket(TicketID=ticket_id, Queue=queue, Changed=changed, DynamicField_TicketIPAddress=ip_address)
+
+
+class StubConnection:
+    def __init__(self, *tickets):
+        self.tickets = {t.get_field('TicketID'): t for t in tickets}
+        self.searches = []
+
+    def send_request(self, http_method, semantic_url, TicketID=None, params='', **kwargs):
+        args = dict(pair.split('=', 1) for pair in params.split('&') if pair)
+        if TicketID is None:
+            self.searches.append(args)
+            return {'TicketID': [tid for tid, ticket in self.tickets.items() if self._matches(ticket, args)]}
+        ticket = self.tickets[TicketID].dict(dynamic_fields=args['DynamicFields'] == '1')
+        ticket['Article'] = [{'Subject': 'Subject', 'Body': 'Body'}]
+        return {'Ticket': [ticket]}
+
+
+    @staticmethod
+    def _matches(ticket, args):
+        for name, value in args.items():
+            if name == 'TicketChangeTimeNewerDate':
+                if ticket.get_field('Changed') < value:
+                    return False
+            elif ticket.get_field(name) != value:
+                return False
+        return True
+
+
+class TestTicketIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TicketIndex()
+        self.index.add(make_ticket('1', '10.0.0.1', '2020-01-01 10:00:00'))
+        self.index.add(make_ticket('2', '10.0.0.2', '2020-01-01 11:00:00', queue='Junk'))
+
+    def test_find_by_dynamic_field(self):
+        found = self.index.find_by_dynamic_field('TicketIPAddress', '10.0.0.1')
+        self.assertEqual(['1'], [t.get_field('TicketID') for t in found])
+
+    def test_filter(self):
+        self.assertEqual(2, len(self.index.filter()))
+        self.assertEqual([], self.index.filter(Queue='Junk', DynamicField_TicketIPAddress='10.0.0.1'))
+
+    def test_update_replaces_old_values(self):
+        self.index.add(make_ticket('1', '10.0.0.3', '2020-01-01 12:00:00'))
+        self.assertEqual([], self.index.find_by_dynamic_field('TicketIPAddress', '10.0.0.1'))
+        self.assertEqual(1, len(self.index.find_by_dynamic_field('TicketIPAddress', '10.0.0.3')))
+        self.assertEqual(2, len(self.index))
+
+    def test_list_values_indexed_by_item(self):
+        self.index.add(Ticket(TicketID='3', DynamicField_Hosts=['host-a', 'host-b']))
+        self.assertEqual(1, len(self.index.find_by_dynamic_field('Hosts', 'host-b')))
+        self.assertEqual([], self.index.filter(Unknown='value'))
+        self.assertNotIn('Unknown', self.index._values)
+
+
+class TestTicketIndexFeeding(unittest.TestCase):
+    def setUp(self):
+        self.connection = StubConnection(make_ticket('1', '10.0.0.1', '2020-01-01 10:00:00'))
+        self.client = otrs.OTRS(connection=self.connection)
+
+    def test_fed_by_ticket_get_with_dynamic_fields(self):
+        index = self.client.enable_index()
+        self.client.ticket_get('1')
+        self.client.ticket_get('1', dynamic_fields=False)
+        found = index.find_by_dynamic_field('TicketIPAddress', '10.0.0.1')
+        self.assertEqual(['1'], [t.get_field('TicketID') for t in found])
+        self.assertIsNone(found[0].article)
+
+    def test_stale_index_refreshed_with_load_arguments(self):
+        index = self.client.enable_index(max_staleness=0.0)
+        index.load(Queue='Raw')
+        self.assertEqual([{'Queue': 'Raw'}], self.connection.searches)
+
+        self.connection.tickets['1'] = make_ticket('1', '10.0.0.9', '2020-01-01 12:00:00')
+        found = index.find_by_dynamic_field('TicketIPAddress', '10.0.0.9')
+        self.assertEqual(['1'], [t.get_field('TicketID') for t in found])
+        self.assertEqual([{'TicketChangeTimeNewerDate': '2020-01-01 10:00:00', 'Queue': 'Raw'},
+                          {'TicketChangeTimeNewerDate': '2020-01-01 10:00:00'}], self.connection.searches[-2:])
+        self.assertEqual([], index.find_by_dynamic_field('TicketIPAddress', '10.0.0.1'))
+
+    def test_ticket_get_does_not_move_refresh_time(self):
+        self.connection.tickets['2'] = make_ticket('2', '10.0.0.2', '2020-01-01 10:00:00', queue='Junk')
+        index = self.client.enable_index(max_staleness=0.0, Queue='Raw')
+        index.refresh()
+        self.connection.tickets['1'] = make_ticket('1', '10.0.0.9', '2020-01-01 11:00:00')
+        self.connection.tickets['2'] = make_ticket('2', '10.0.0.2', '2020-01-01 12:00:00', queue='Junk')
+        self.client.ticket_get('2')
+        self.assertEqual(1, len(index.find_by_dynamic_field('TicketIPAddress', '10.0.0.9')))
+
+    def test_ticket_left_search_scope_removed(self):
+        index = self.client.enable_index(max_staleness=0.0, Queue='Raw')
+        index.refresh()
+        self.connection.tickets['1'] = make_ticket('1', '10.0.0.1', '2020-01-01 11:00:00', queue='Junk')
+        self.assertEqual([], index.filter(Queue='Raw'))
+
+    def test_refresh_requires_search_arguments(self):
+        index = self.client.enable_index(max_staleness=60.0)
+        with self.assertRaises(ArgumentMissingError):
+            index.find_by_dynamic_field('TicketIPAddress', '10.0.0.1')
+        self.assertEqual([], self.connection.searches)
+
+    def test_empty_stale_index_pulls_search_scope(self):
+        index = self.client.enable_index(max_staleness=60.0, Queue='Raw')
+        self.assertEqual(1, len(index.find_by_dynamic_field('TicketIPAddress', '10.0.0.1')))
+        self.assertEqual([{'Queue': 'Raw'}], self.connection.searches)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -43,7 +43,7 @@ setup(
     # simple. Or you can use find_packages().
     # packages=find_packages(exclude=['tests', 'data']),
 
-    py_modules=["otrs"],
+    packages=['otrs_python_api', 'otrs_python_api.utils'],
 
     install_requires=['requests'],
 
@@ -71,9 +71,9 @@ setup(
     # To provide executable scripts, use entry points in preference to the
     # "scripts" keyword. Entry points provide cross-platform support and allow
     # pip to create the appropriate form of executable for the target platform.
-    # entry_points={
-    #    'console_scripts': [
-    #        'sample=sample:main',
-    #    ],
-    # },
+    entry_points={
+        'console_scripts': [
+            'otrs=otrs_python_api.cli:main',
+        ],
+    },
 )